@@ -1,21 +1,21 @@
 import streamlit as st
 import pandas as pd
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta, timezone
 import os
+import base64
+import hashlib
+import threading
+import time
 from io import BytesIO
-from github import Github
 import streamlit.components.v1 as components
 
-# PDF
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-
 APP_TITLE = "Project Tracker Pro"
-EXCEL_FILE = "projects.xlsx"
+PARQUET_FILE = "projects.parquet"
+EXCEL_FILE = "projects.xlsx"  # legacy store, only read once to seed the Parquet file
 SHEET_NAME = "Projects"
 LOGO_PATH = "assets/logo.png"
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+COMMIT_DEBOUNCE_SECONDS = 10
 
 # -----------------------------
 # Helpers: Auth & Secrets
@@ -38,17 +38,24 @@ if not USERS:
         "viewer": {"password": "viewer", "role": "viewer"},
     }
 
+def sign_in():
+    # Runs as a button callback, i.e. before the rerun renders the page
+    username = st.session_state.get("login_username", "")
+    password = st.session_state.get("login_password", "")
+    if username in USERS and USERS[username]["password"] == password:
+        st.session_state["auth_user"] = username
+        st.session_state["auth_role"] = USERS[username]["role"]
+        st.session_state.pop("login_failed", None)
+    else:
+        st.session_state["login_failed"] = True
+
 def login_ui():
     st.sidebar.markdown("### 🔐 Login")
-    username = st.sidebar.text_input("Username")
-    password = st.sidebar.text_input("Password", type="password")
-    if st.sidebar.button("Sign in"):
-        if username in USERS and USERS[username]["password"] == password:
-            st.session_state["auth_user"] = username
-            st.session_state["auth_role"] = USERS[username]["role"]
-            st.experimental_rerun()
-        else:
-            st.sidebar.error("Invalid username or password")
+    st.sidebar.text_input("Username", key="login_username")
+    st.sidebar.text_input("Password", type="password", key="login_password")
+    st.sidebar.button("Sign in", on_click=sign_in)
+    if st.session_state.get("login_failed"):
+        st.sidebar.error("Invalid username or password")
     st.sidebar.caption("Default test: admin/admin, viewer/viewer")
 
 def is_admin():
@@ -60,17 +67,120 @@ def current_user():
 # -----------------------------
 # Data IO
 # -----------------------------
-def ensure_excel():
-    if not os.path.exists(EXCEL_FILE):
+def ensure_store():
+    if os.path.exists(PARQUET_FILE):
+        return
+    if os.path.exists(EXCEL_FILE):
+        # One-time migration from the legacy workbook
+        df = pd.read_excel(EXCEL_FILE, sheet_name=SHEET_NAME, engine="calamine")
+    else:
         df = pd.DataFrame(columns=["Year","Project Code","Project Name","Location","Project Start","Project End","Project Team"])
-        df.to_excel(EXCEL_FILE, sheet_name=SHEET_NAME, index=False)
+    save_data(df)
+
+def data_mtime():
+    ensure_store()
+    return os.path.getmtime(PARQUET_FILE)
 
-def load_data():
-    ensure_excel()
-    return pd.read_excel(EXCEL_FILE, sheet_name=SHEET_NAME)
+@st.cache_data(show_spinner=False)
+def load_data(mtime):
+    # mtime is only part of the cache key, so a changed file on disk is re-read
+    df = pd.read_parquet(PARQUET_FILE, engine="pyarrow")
+    # Normalise once here so every consumer can rely on datetime64 dates
+    for c in ("Project Start", "Project End"):
+        df[c] = pd.to_datetime(df[c], errors="coerce")
+    return df
 
 def save_data(df: pd.DataFrame):
-    df.to_excel(EXCEL_FILE, sheet_name=SHEET_NAME, index=False)
+    df = df.copy()
+    # Parquet needs one type per column; form inputs give date objects, the store holds timestamps
+    for c in ("Project Start", "Project End"):
+        df[c] = pd.to_datetime(df[c], errors="coerce")
+    for c in ("Project Code", "Project Name", "Location", "Project Team"):
+        df[c] = df[c].where(df[c].isna(), df[c].astype(str))
+    # Write then rename so the background pusher never reads a half-written file
+    tmp_path = PARQUET_FILE + ".tmp"
+    df.to_parquet(tmp_path, engine="pyarrow", compression="zstd", index=False)
+    os.replace(tmp_path, PARQUET_FILE)
+    load_data.clear()
+    filter_options.clear()
+    search_haystack.clear()
+
+REQUIRED_EDITOR_COLS = ("Project Code", "Project Start", "Project End")
+
+def _is_blank(val):
+    return val is None or (isinstance(val, str) and not val.strip()) or (not isinstance(val, str) and pd.isna(val))
+
+def editor_change_errors(changes, allow_add=False):
+    # The old form always supplied a code and both dates; keep the editor to the same rule
+    errors = []
+    for pos, cols in changes.get("edited_rows", {}).items():
+        for col in REQUIRED_EDITOR_COLS:
+            if col in cols and _is_blank(cols[col]):
+                errors.append(f"Row {int(pos) + 1}: {col} cannot be empty.")
+    if allow_add:
+        for n, row in enumerate(changes.get("added_rows", []), start=1):
+            missing = [col for col in REQUIRED_EDITOR_COLS if _is_blank(row.get(col))]
+            if missing:
+                errors.append(f"New row {n}: missing {', '.join(missing)}.")
+    return errors
+
+def apply_editor_changes(df: pd.DataFrame, row_index, changes, allow_add=False):
+    # Editor positions refer to the rows it was shown; map them back to df labels
+    for pos, cols in changes.get("edited_rows", {}).items():
+        idx = row_index[int(pos)]
+        for col, val in cols.items():
+            if col in ("Project Start", "Project End"):
+                val = pd.to_datetime(val)
+            df.loc[idx, col] = val
+    df = df.drop(index=[row_index[int(pos)] for pos in changes.get("deleted_rows", [])])
+    added = changes.get("added_rows", []) if allow_add else []
+    if added:
+        df = pd.concat([df, pd.DataFrame(added)], ignore_index=True)
+    return df.reset_index(drop=True)
+
+def excel_bytes(df: pd.DataFrame):
+    # Not constant_memory: to_excel writes column by column, which that mode silently truncates
+    buf = BytesIO()
+    with pd.ExcelWriter(buf, engine="xlsxwriter") as w:
+        df.to_excel(w, sheet_name=SHEET_NAME, index=False)
+    return buf.getvalue()
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def filter_options(df: pd.DataFrame):
+    years = sorted(df["Year"].dropna().unique().tolist())
+    locations = sorted(df["Location"].dropna().unique().tolist())
+    return years, locations
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def search_haystack(df: pd.DataFrame):
+    # One lowercase string per row so the search box needs a single scan
+    sep = "\x1f"
+    return (
+        df["Project Code"].fillna("").astype(str) + sep
+        + df["Project Name"].fillna("").astype(str) + sep
+        + df["Location"].fillna("").astype(str)
+    ).str.lower()
+
+def filter_projects(df: pd.DataFrame, version, year_filter, location_filter, code_query):
+    # Reuse the last result while neither the store nor the filters changed;
+    # `version` is the store mtime because the cached df is a fresh copy each rerun
+    key = (version, year_filter, location_filter, code_query)
+    cached = st.session_state.get("filtered_cache")
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    filtered = df.copy()
+    if year_filter != "All":
+        filtered = filtered[filtered["Year"] == (int(year_filter) if isinstance(year_filter, str) and year_filter.isdigit() else year_filter)]
+    if location_filter != "All":
+        filtered = filtered[filtered["Location"] == location_filter]
+    if code_query:
+        q = code_query.lower()
+        haystack = search_haystack(df).loc[filtered.index]
+        filtered = filtered[haystack.str.contains(q, regex=False, na=False)]
+
+    st.session_state["filtered_cache"] = (key, filtered)
+    return filtered
 
 # -----------------------------
 # GitHub commit
@@ -78,7 +188,119 @@ def save_data(df: pd.DataFrame):
 def can_commit_to_github():
     return "GITHUB_TOKEN" in st.secrets and "GITHUB_REPO" in st.secrets
 
-def commit_excel_to_github(message="Update projects.xlsx"):
+HEAD_OID_QUERY = """
+query($owner: String!, $name: String!, $ref: String!) {
+  repository(owner: $owner, name: $name) { ref(qualifiedName: $ref) { target { oid } } }
+}
+"""
+
+CREATE_COMMIT_MUTATION = """
+mutation($input: CreateCommitOnBranchInput!) {
+  createCommitOnBranch(input: $input) { commit { oid url } }
+}
+"""
+
+@st.cache_resource
+def _github_http():
+    import httpx  # only needed once something is pushed
+    # One keep-alive client for the whole app, so pushes reuse the TCP/TLS connection
+    return httpx.Client(timeout=30)
+
+def _github_graphql(token, query, variables):
+    resp = _github_http().post(
+        GITHUB_GRAPHQL_URL,
+        json={"query": query, "variables": variables},
+        headers={"Authorization": f"bearer {token}"},
+    )
+    resp.raise_for_status()
+    payload = resp.json()
+    if payload.get("errors"):
+        raise RuntimeError(payload["errors"][0].get("message", "GraphQL error"))
+    return payload["data"]
+
+def _branch_head_oid(head_oids, token, repo_name, branch):
+    key = (repo_name, branch)
+    if key not in head_oids:
+        owner, name = repo_name.split("/", 1)
+        data = _github_graphql(token, HEAD_OID_QUERY, {"owner": owner, "name": name, "ref": f"refs/heads/{branch}"})
+        head_oids[key] = data["repository"]["ref"]["target"]["oid"]
+    return head_oids[key]
+
+def _push_file_to_github(head_oids, token, repo_name, branch, path, content_bytes, message):
+    contents = base64.b64encode(content_bytes).decode("ascii")
+    for attempt in range(2):
+        commit_input = {
+            "branch": {"repositoryNameWithOwner": repo_name, "branchName": branch},
+            "message": {"headline": message},
+            "expectedHeadOid": _branch_head_oid(head_oids, token, repo_name, branch),
+            "fileChanges": {"additions": [{"path": path, "contents": contents}]},
+        }
+        try:
+            data = _github_graphql(token, CREATE_COMMIT_MUTATION, {"input": commit_input})
+        except RuntimeError as e:
+            # Only a moved branch is worth a retry: refetch its head once
+            if attempt or "expected branch to point to" not in str(e).lower():
+                raise
+            head_oids.pop((repo_name, branch), None)
+            continue
+        commit = data["createCommitOnBranch"]["commit"]
+        head_oids[(repo_name, branch)] = commit["oid"]
+        return commit["url"]
+
+class GitHubPusher:
+    """Daemon that coalesces queued saves into one commit per edit burst."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending_commit = threading.Event()
+        self.target = None
+        self.messages = []
+        self.queued_version = 0
+        self.pushed_version = 0
+        self.last_error = None
+        self.head_oids = {}
+        self.pushed_digest = None
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def queue(self, token, repo_name, branch, message):
+        with self.lock:
+            self.target = (token, repo_name, branch)
+            self.messages.append(message)
+            self.queued_version += 1
+            version = self.queued_version
+        self.pending_commit.set()
+        return version
+
+    def _run(self):
+        while True:
+            self.pending_commit.wait()
+            # Let the burst settle; saves arriving meanwhile join this commit
+            time.sleep(COMMIT_DEBOUNCE_SECONDS)
+            with self.lock:
+                self.pending_commit.clear()
+                target, messages = self.target, self.messages
+                self.messages = []
+                version = self.queued_version
+            try:
+                with open(PARQUET_FILE, "rb") as f:
+                    content_bytes = f.read()
+                digest = hashlib.sha256(content_bytes).hexdigest()
+                # Nothing to send if the burst ended where the last push left off
+                if digest != self.pushed_digest:
+                    message = "; ".join(dict.fromkeys(messages))
+                    _push_file_to_github(self.head_oids, *target, PARQUET_FILE, content_bytes, message)
+                    self.pushed_digest = digest
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+            self.pushed_version = version
+
+@st.cache_resource
+def github_pusher():
+    # Shared across reruns and sessions so there is only ever one daemon
+    return GitHubPusher()
+
+def commit_store_to_github(message="Update projects.parquet"):
     try:
         if not can_commit_to_github():
             st.info("ℹ️ GitHub secrets not configured; skipping commit.")
@@ -86,33 +308,44 @@ def commit_excel_to_github(message="Update projects.xlsx"):
         token = st.secrets["GITHUB_TOKEN"]
         repo_name = st.secrets["GITHUB_REPO"]
         branch = st.secrets.get("GITHUB_BRANCH", "main")
-        g = Github(token)
-        repo = g.get_repo(repo_name)
-
-        with open(EXCEL_FILE, "rb") as f:
-            content_bytes = f.read()
-
-        try:
-            remote = repo.get_contents(EXCEL_FILE, ref=branch)
-            repo.update_file(remote.path, message, content_bytes, remote.sha, branch=branch)
-        except Exception:
-            repo.create_file(EXCEL_FILE, "Create projects.xlsx", content_bytes, branch=branch)
-        st.success("📤 Changes pushed to GitHub.")
+        st.session_state["github_push_version"] = github_pusher().queue(token, repo_name, branch, message)
+        st.info("⏳ Changes queued for GitHub.")
     except Exception as e:
         st.error(f"GitHub commit failed: {e}")
 
+def show_github_push_status():
+    version = st.session_state.get("github_push_version")
+    if version is None:
+        return
+    pusher = github_pusher()
+    if pusher.pushed_version < version:
+        st.info("⏳ Pushing changes to GitHub in background…")
+        return
+    del st.session_state["github_push_version"]
+    if pusher.last_error is not None:
+        st.error(f"GitHub commit failed: {pusher.last_error}")
+    else:
+        st.success("📤 Changes pushed to GitHub.")
+
 # -----------------------------
 # ICS (Calendar) helpers
 # -----------------------------
 def date_to_ics(d):
-    # all-day event date format YYYYMMDD
-    return pd.to_datetime(d).strftime("%Y%m%d")
+    # all-day event date format YYYYMMDD; None when the date is missing or was unparseable
+    if pd.isna(d):
+        return None
+    return d.strftime("%Y%m%d")
+
+def ics_dtstamp():
+    # One DTSTAMP per export; stdlib datetime avoids building a pandas Timestamp
+    return datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
 
 def make_ics_for_row(row):
     start = date_to_ics(row["Project Start"])
     # DTEND in all-day should be day after end date
-    end_plus = pd.to_datetime(row["Project End"]) + timedelta(days=1)
-    end = end_plus.strftime("%Y%m%d")
+    end = date_to_ics(row["Project End"] + timedelta(days=1))
+    if start is None or end is None:
+        return None
     summary = f"{row['Project Code']} - {row['Project Name']}"
     location = str(row.get("Location", ""))
 
@@ -121,7 +354,7 @@ VERSION:2.0
 PRODID:-//Project Tracker Pro//EN
 BEGIN:VEVENT
 UID:{row['Project Code']}@project-tracker
-DTSTAMP:{pd.Timestamp.utcnow().strftime('%Y%m%dT%H%M%SZ')}
+DTSTAMP:{ics_dtstamp()}
 DTSTART;VALUE=DATE:{start}
 DTEND;VALUE=DATE:{end}
 SUMMARY:{summary}
@@ -132,28 +365,44 @@ END:VCALENDAR
 """
     return ics.encode("utf-8")
 
+@st.cache_data(max_entries=8, show_spinner=False)
 def make_ics_for_dataframe(df):
-    ics = "BEGIN:VCALENDAR\nVERSION:2.0\nPRODID:-//Project Tracker Pro//EN\n"
-    for _, r in df.iterrows():
-        ics += "BEGIN:VEVENT\n"
-        ics += f"UID:{r['Project Code']}@project-tracker\n"
-        ics += f"DTSTAMP:{pd.Timestamp.utcnow().strftime('%Y%m%dT%H%M%SZ')}\n"
-        ics += f"DTSTART;VALUE=DATE:{date_to_ics(r['Project Start'])}\n"
-        end_plus = pd.to_datetime(r["Project End"]) + timedelta(days=1)
-        ics += f"DTEND;VALUE=DATE:{end_plus.strftime('%Y%m%d')}\n"
-        ics += f"SUMMARY:{r['Project Code']} - {r['Project Name']}\n"
-        ics += f"LOCATION:{str(r.get('Location',''))}\n"
-        ics += f"DESCRIPTION:Team: {str(r.get('Project Team',''))}\n"
-        ics += "END:VEVENT\n"
-    ics += "END:VCALENDAR\n"
-    return ics.encode("utf-8")
+    parts = ["BEGIN:VCALENDAR\nVERSION:2.0\nPRODID:-//Project Tracker Pro//EN\n"]
+    dtstamp = ics_dtstamp()
+    # Rows without both dates cannot become all-day events
+    df = df[df["Project Start"].notna() & df["Project End"].notna()]
+    starts = df["Project Start"].dt.strftime("%Y%m%d").to_numpy()
+    # DTEND in all-day should be day after end date
+    ends = (df["Project End"] + pd.Timedelta(days=1)).dt.strftime("%Y%m%d").to_numpy()
+    rows = df[["Project Code","Project Name","Location","Project Team"]].itertuples(index=False, name=None)
+    for (code, name, loc, team), start, end in zip(rows, starts, ends):
+        parts.append(
+            "BEGIN:VEVENT\n"
+            f"UID:{code}@project-tracker\n"
+            f"DTSTAMP:{dtstamp}\n"
+            f"DTSTART;VALUE=DATE:{start}\n"
+            f"DTEND;VALUE=DATE:{end}\n"
+            f"SUMMARY:{code} - {name}\n"
+            f"LOCATION:{loc}\n"
+            f"DESCRIPTION:Team: {team}\n"
+            "END:VEVENT\n"
+        )
+    parts.append("END:VCALENDAR\n")
+    return "".join(parts).encode("utf-8")
 
 # -----------------------------
 # PDF helpers
 # -----------------------------
+@st.cache_data(max_entries=8, show_spinner=False)
 def make_pdf_from_dataframe(df, title="Project Report"):
+    # ReportLab is heavy to import; load it only when a PDF is built
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, LongTable, TableStyle
+
     buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=24, leftMargin=24, topMargin=24, bottomMargin=24)
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=24, leftMargin=24, topMargin=24, bottomMargin=24, pageCompression=1)
     styles = getSampleStyleSheet()
     elements = []
     elements.append(Paragraph(f"<b>{title}</b>", styles['Title']))
@@ -163,8 +412,13 @@ def make_pdf_from_dataframe(df, title="Project Report"):
         elements.append(Paragraph("No data.", styles['Normal']))
     else:
         cols = ["Year","Project Code","Project Name","Location","Project Start","Project End","Project Team"]
-        data = [cols] + df[cols].astype(str).values.tolist()
-        table = Table(data, repeatRows=1)
+        # Object array keeps the existing values; ReportLab stringifies cells as it draws them
+        values = df[cols].to_numpy(dtype=object)
+        for c in ("Project Start", "Project End"):
+            values[:, cols.index(c)] = df[c].dt.strftime("%Y-%m-%d").fillna("").to_numpy()
+        data = [cols]
+        data.extend(row.tolist() for row in values)
+        table = LongTable(data, repeatRows=1)
         table.setStyle(TableStyle([
             ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#4CAF50')),
             ('TEXTCOLOR', (0,0), (-1,0), colors.white),
@@ -177,8 +431,7 @@ def make_pdf_from_dataframe(df, title="Project Report"):
         elements.append(table)
 
     doc.build(elements)
-    buffer.seek(0)
-    return buffer
+    return buffer.getvalue()
 
 # -----------------------------
 # UI
@@ -199,36 +452,34 @@ if "auth_user" not in st.session_state:
     st.stop()
 else:
     st.sidebar.success(f"Logged in as: {current_user()} ({st.session_state.get('auth_role')})")
-    if st.sidebar.button("Sign out"):
-        st.session_state.clear()
-        st.experimental_rerun()
+    st.sidebar.button("Sign out", on_click=st.session_state.clear)
 
-df = load_data()
+show_github_push_status()
+if "last_action" in st.session_state:
+    st.success(st.session_state.pop("last_action"))
+df_version = data_mtime()
+df = load_data(df_version)
 
 # Filters
 with st.sidebar:
     st.markdown("### 🔎 Filters")
-    years = ["All"] + sorted([y for y in df["Year"].dropna().unique().tolist()])
+    year_opts, location_opts = filter_options(df)
+    years = ["All"] + year_opts
     year_filter = st.selectbox("Year", years)
-    locations = ["All"] + sorted([l for l in df["Location"].dropna().unique().tolist()])
+    locations = ["All"] + location_opts
     location_filter = st.selectbox("Location", locations)
     code_query = st.text_input("Search code/name/location")
 
-filtered = df.copy()
-if year_filter != "All":
-    filtered = filtered[filtered["Year"] == (int(year_filter) if isinstance(year_filter, str) and year_filter.isdigit() else year_filter)]
-if location_filter != "All":
-    filtered = filtered[filtered["Location"] == location_filter]
-if code_query:
-    q = code_query.lower()
-    filtered = filtered[
-        filtered["Project Code"].fillna("").str.lower().str.contains(q)
-        | filtered["Project Name"].fillna("").str.lower().str.contains(q)
-        | filtered["Location"].fillna("").str.lower().str.contains(q)
-    ]
+filtered = filter_projects(df, df_version, year_filter, location_filter, code_query)
 
 st.subheader("📋 Project List")
-st.dataframe(filtered, use_container_width=True)
+PAGE_SIZE = 50
+page_count = max(1, -(-len(filtered) // PAGE_SIZE))
+page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+# Only the visible page is sent to the browser; exports below still use all of `filtered`
+page_rows = filtered.iloc[(page - 1) * PAGE_SIZE : page * PAGE_SIZE]
+st.dataframe(page_rows, use_container_width=True, hide_index=True)
+st.caption(f"Page {page} of {page_count} · {len(filtered)} projects")
 
 # Print / Export / Calendar
 with st.expander("🖨️ Print / Export / Calendar"):
@@ -237,32 +488,40 @@ with st.expander("🖨️ Print / Export / Calendar"):
         components.html("<script>window.print();</script>", height=0)
 
     # Download filtered Excel
-    buf_xls = BytesIO()
-    filtered.to_excel(buf_xls, index=False)
-    buf_xls.seek(0)
-    st.download_button("📥 Download filtered Excel", data=buf_xls, file_name="projects_filtered.xlsx")
+    st.download_button("📥 Download filtered Excel", data=excel_bytes(filtered), file_name="projects_filtered.xlsx")
+
+    # Master workbook is only built on request
+    if st.button("Export master XLSX"):
+        st.download_button("📥 Download master XLSX", data=excel_bytes(df), file_name=EXCEL_FILE, key="dl_master_xlsx")
 
     # Export filtered to PDF
-    pdf_buf = make_pdf_from_dataframe(filtered, title="Project Tracker – Filtered Report")
-    st.download_button("🧾 Export filtered to PDF", data=pdf_buf, file_name="projects_filtered.pdf", mime="application/pdf")
+    pdf_bytes = make_pdf_from_dataframe(filtered, title="Project Tracker – Filtered Report")
+    st.download_button("🧾 Export filtered to PDF", data=pdf_bytes, file_name="projects_filtered.pdf", mime="application/pdf")
 
     # Calendar: select a row to generate ICS
     if len(filtered) > 0:
         idxs = list(filtered.index)
         sel = st.selectbox("Select a row for calendar (.ics)", options=idxs, format_func=lambda i: f"{filtered.loc[i,'Project Code']} – {filtered.loc[i,'Project Name']}")
         ics_single = make_ics_for_row(df.loc[sel])
-        st.download_button("📅 Download .ics for selected project", data=ics_single, file_name=f"{df.loc[sel,'Project Code']}.ics", mime="text/calendar", key="dl_single_ics")
+        if ics_single is None:
+            st.warning("This project has no valid start/end date, so no calendar event can be made. Fix its dates below.")
+        else:
+            st.download_button("📅 Download .ics for selected project", data=ics_single, file_name=f"{df.loc[sel,'Project Code']}.ics", mime="text/calendar", key="dl_single_ics")
 
         # Bulk ICS for filtered
+        undated = int((filtered["Project Start"].isna() | filtered["Project End"].isna()).sum())
+        if undated:
+            st.caption(f"{undated} project(s) without valid dates are left out of the calendar file.")
         bulk_ics = make_ics_for_dataframe(filtered)
         st.download_button("📅 Download .ics (all filtered)", data=bulk_ics, file_name="projects_filtered.ics", mime="text/calendar", key="dl_bulk_ics")
 
 # -----------------------------
 # Add Project (Admin only)
 # -----------------------------
-st.markdown("---")
-st.subheader("➕ Add New Project")
-if is_admin():
+# Add and Edit are fragments: their widgets rerun only their own section.
+# A save calls st.rerun() so the project list above reflects the new data.
+@st.fragment
+def add_project_section(df):
     with st.form("add_project_form"):
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -287,64 +546,79 @@ if is_admin():
                 "Project End": end,
                 "Project Team": team.strip(),
             }
-            df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-            save_data(df)
-            commit_excel_to_github("Add project")
-            st.success("✅ Project added.")
-            st.experimental_rerun()
+            # Queue locally; one save below writes the whole batch
+            st.session_state.setdefault("pending_projects", []).append(new_row)
+            st.success("✅ Project queued. Save to write it to the tracker.")
+
+    pending = st.session_state.get("pending_projects", [])
+    if pending:
+        st.caption(f"{len(pending)} project(s) waiting to be saved")
+        st.dataframe(pd.DataFrame(pending), use_container_width=True, hide_index=True)
+        c1, c2 = st.columns(2)
+        if c1.button(f"💾 Save {len(pending)} project(s)"):
+            save_data(pd.concat([df, pd.DataFrame(pending)], ignore_index=True))
+            commit_store_to_github(f"Add {len(pending)} project(s)")
+            st.session_state["pending_projects"] = []
+            st.session_state["last_action"] = "✅ Projects added."
+            st.rerun()
+        if c2.button("Discard pending"):
+            st.session_state["pending_projects"] = []
+            st.rerun(scope="fragment")
+
+st.markdown("---")
+st.subheader("➕ Add New Project")
+if is_admin():
+    add_project_section(df)
 else:
     st.info("Only Top Management (admin) can add new projects.")
 
 # -----------------------------
 # Edit / Delete (Admin OR Assigned in Project Team)
 # -----------------------------
-st.markdown("---")
-st.subheader("✏️ Edit / Delete Project")
-
-if len(df) == 0:
-    st.info("No projects to edit yet.")
-else:
-    row_idx = st.number_input("Select row index to edit (0-based)", min_value=0, max_value=len(df)-1, step=1)
-    row_team = str(df.loc[row_idx, "Project Team"] or "").lower()
+def can_edit_team(team):
     user = current_user().lower()
-    can_edit = is_admin() or (user and user in [u.strip().lower() for u in row_team.split(",") if u.strip()])
+    return is_admin() or (user and user in [u.strip().lower() for u in str(team or "").split(",") if u.strip()])
 
-    if not can_edit:
-        st.warning("You are not authorized to edit this project. Ask admin to add your username into 'Project Team'.")
-    else:
-        with st.form("edit_form"):
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                year_e = st.number_input("Year", 2000, 2100, int(df.loc[row_idx, "Year"]) if not pd.isna(df.loc[row_idx, "Year"]) else date.today().year)
-                code_e = st.text_input("Project Code", str(df.loc[row_idx, "Project Code"] or ""))
-            with col2:
-                name_e = st.text_input("Project Name", str(df.loc[row_idx, "Project Name"] or ""))
-                location_e = st.text_input("Location", str(df.loc[row_idx, "Location"] or ""))
-            with col3:
-                start_e = st.date_input("Project Start", pd.to_datetime(df.loc[row_idx, "Project Start"]).date() if not pd.isna(df.loc[row_idx, "Project Start"]) else date.today())
-                end_e = st.date_input("Project End", pd.to_datetime(df.loc[row_idx, "Project End"]).date() if not pd.isna(df.loc[row_idx, "Project End"]) else date.today())
-            team_e = st.text_area("Project Team (comma-separated usernames)", str(df.loc[row_idx, "Project Team"] or ""))
-
-            c1, c2 = st.columns(2)
-            do_update = c1.form_submit_button("💾 Update Project")
-            do_delete = c2.form_submit_button("🗑️ Delete Project")
-
-        if do_update:
-            df.loc[row_idx, "Year"] = int(year_e)
-            df.loc[row_idx, "Project Code"] = code_e.strip()
-            df.loc[row_idx, "Project Name"] = name_e.strip()
-            df.loc[row_idx, "Location"] = location_e.strip()
-            df.loc[row_idx, "Project Start"] = start_e
-            df.loc[row_idx, "Project End"] = end_e
-            df.loc[row_idx, "Project Team"] = team_e.strip()
-            save_data(df)
-            commit_excel_to_github("Edit project")
-            st.success("✅ Updated.")
-            st.experimental_rerun()
-
-        if do_delete:
-            df = df.drop(index=row_idx).reset_index(drop=True)
-            save_data(df)
-            commit_excel_to_github("Delete project")
-            st.success("🗑️ Deleted.")
-            st.experimental_rerun()
+@st.fragment
+def edit_project_section(df, page_rows):
+    # Only rows on the current page that this user may change are offered for editing
+    editable = page_rows[[bool(can_edit_team(t)) for t in page_rows["Project Team"]]]
+
+    if len(df) == 0:
+        st.info("No projects to edit yet.")
+        return
+    if len(editable) == 0:
+        st.warning("You are not authorized to edit these projects. Ask admin to add your username into 'Project Team'.")
+        return
+
+    st.caption("Edit cells in place or select rows to delete, then save. Covers the projects on the current page.")
+    st.data_editor(
+        editable,
+        key="proj_editor",
+        num_rows="dynamic",
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "Year": st.column_config.NumberColumn("Year", min_value=2000, max_value=2100, step=1),
+            "Project Code": st.column_config.TextColumn("Project Code", required=True),
+            "Project Start": st.column_config.DateColumn("Project Start", required=True),
+            "Project End": st.column_config.DateColumn("Project End", required=True),
+        },
+    )
+    changes = st.session_state.get("proj_editor", {})
+    if not is_admin() and changes.get("added_rows"):
+        st.info("Only Top Management (admin) can add new projects; added rows will be ignored.")
+    if any(changes.get(k) for k in ("edited_rows", "added_rows", "deleted_rows")):
+        if st.button("💾 Save changes"):
+            errors = editor_change_errors(changes, allow_add=is_admin())
+            if errors:
+                st.error("Not saved:\n\n" + "\n\n".join(errors))
+            else:
+                save_data(apply_editor_changes(df, editable.index, changes, allow_add=is_admin()))
+                commit_store_to_github("Edit projects")
+                st.session_state["last_action"] = "✅ Updated."
+                st.rerun()
+
+st.markdown("---")
+st.subheader("✏️ Edit / Delete Project")
+edit_project_section(df, page_rows)
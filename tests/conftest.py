@@ -0,0 +1,18 @@
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """Import main.py in bare mode with its store in a throwaway directory."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(ROOT))
+    sys.modules.pop("main", None)
+    module = importlib.import_module("main")
+    yield module
+    sys.modules.pop("main", None)
@@ -0,0 +1,42 @@
+from pathlib import Path
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+MAIN = str(Path(__file__).resolve().parents[1] / "main.py")
+
+
+def projects_with_undated_row():
+    return pd.DataFrame({
+        "Year": [2024, 2024],
+        "Project Code": ["P-1", "P-2"],
+        "Project Name": ["Alpha", "Beta"],
+        "Location": ["KL", "KL"],
+        "Project Start": pd.to_datetime([None, "2024-01-01"]),
+        "Project End": pd.to_datetime([None, "2024-01-31"]),
+        "Project Team": ["ali", "ali"],
+    })
+
+
+def test_row_without_dates_gives_no_event(app):
+    df = projects_with_undated_row()
+    assert app.make_ics_for_row(df.loc[0]) is None
+    assert b"DTSTART;VALUE=DATE:20240101" in app.make_ics_for_row(df.loc[1])
+
+
+def test_bulk_ics_skips_rows_without_dates(app):
+    ics = app.make_ics_for_dataframe(projects_with_undated_row()).decode("utf-8")
+    assert ics.count("BEGIN:VEVENT") == 1
+    assert "UID:P-2@project-tracker" in ics
+    assert "nan" not in ics
+
+
+def test_page_renders_with_an_undated_project(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    projects_with_undated_row().to_parquet("projects.parquet")
+    at = AppTest.from_file(MAIN, default_timeout=30)
+    at.session_state["auth_user"] = "admin"
+    at.session_state["auth_role"] = "admin"
+    at.run()
+    assert not at.exception
+    assert "✏️ Edit / Delete Project" in [s.value for s in at.subheader]
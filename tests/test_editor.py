@@ -0,0 +1,31 @@
+import pandas as pd
+
+
+def test_added_rows_without_code_or_dates_are_rejected(app):
+    changes = {"added_rows": [{"Project Code": "P-9", "Project Start": "2024-01-01"}, {"Project Name": "No code"}]}
+    errors = app.editor_change_errors(changes, allow_add=True)
+    assert errors == [
+        "New row 1: missing Project End.",
+        "New row 2: missing Project Code, Project Start, Project End.",
+    ]
+
+
+def test_clearing_a_date_cell_is_rejected(app):
+    changes = {"edited_rows": {0: {"Project Start": None, "Project Name": ""}}}
+    assert app.editor_change_errors(changes) == ["Row 1: Project Start cannot be empty."]
+
+
+def test_complete_changes_pass_and_apply(app):
+    df = pd.DataFrame({
+        "Year": [2024], "Project Code": ["P-1"], "Project Name": ["Alpha"], "Location": ["KL"],
+        "Project Start": pd.to_datetime(["2024-01-01"]), "Project End": pd.to_datetime(["2024-01-31"]),
+        "Project Team": ["ali"],
+    })
+    changes = {
+        "edited_rows": {0: {"Project End": "2024-02-15"}},
+        "added_rows": [{"Project Code": "P-2", "Project Start": "2024-03-01", "Project End": "2024-03-31"}],
+    }
+    assert app.editor_change_errors(changes, allow_add=True) == []
+    out = app.apply_editor_changes(df, df.index, changes, allow_add=True)
+    assert out["Project Code"].tolist() == ["P-1", "P-2"]
+    assert out.loc[0, "Project End"] == pd.Timestamp("2024-02-15")
@@ -0,0 +1,27 @@
+from io import BytesIO
+
+import pandas as pd
+
+
+def sample_projects():
+    return pd.DataFrame({
+        "Year": [2024, 2024, 2025],
+        "Project Code": ["P-1", "P-2", "P-3"],
+        "Project Name": ["Alpha", "Beta", "Gamma"],
+        "Location": ["KL", "Penang", "Johor"],
+        "Project Start": pd.to_datetime(["2024-01-01", "2024-03-01", "2025-02-01"]),
+        "Project End": pd.to_datetime(["2024-01-31", "2024-04-15", "2025-06-30"]),
+        "Project Team": ["ali", "ali,siti", "siti"],
+    })
+
+
+def test_excel_export_round_trips_every_cell(app):
+    df = sample_projects()
+    back = pd.read_excel(BytesIO(app.excel_bytes(df)), sheet_name=app.SHEET_NAME, engine="calamine")
+    pd.testing.assert_frame_equal(back, df, check_dtype=False)
+
+
+def test_excel_export_of_filtered_slice_keeps_its_rows(app):
+    filtered = sample_projects().iloc[1:]
+    back = pd.read_excel(BytesIO(app.excel_bytes(filtered)), sheet_name=app.SHEET_NAME, engine="calamine")
+    pd.testing.assert_frame_equal(back, filtered.reset_index(drop=True), check_dtype=False)